@@ -1,33 +1,56 @@
-import chromadb
-from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
 from chunking import semantic_chunking
+from embedder import get_embedder
+from embedding_cache import EmbeddingCache
+from faiss_index import build_index
+from ov_embedder import load_ov_embedder
+from store import get_collection, write_lock
+import hashlib
 import os
 import glob
+import re
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import torch
+
+# Prevent thread oversubscription: N workers x default intra-op threads
+# (== cores) is a well-known CPU inference regression. Override with
+# TORCH_NUM_THREADS / GUNICORN_WORKERS when running multi-worker.
+torch.set_num_threads(int(os.environ.get(
+    "TORCH_NUM_THREADS",
+    max(1, (os.cpu_count() or 1) // int(os.environ.get("GUNICORN_WORKERS", "1")))
+)))
 
 # -----------------------
 # Setup
 # -----------------------
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+ENCODE_BATCH_SIZE = 256
+_TOKEN_RE = re.compile(r"[a-z]+")
 
-client = chromadb.Client(
-    Settings(
-        persist_directory="./chroma_db",
-        anonymized_telemetry=False
-    )
-)
-
-collection = client.get_or_create_collection(
-    name="biolens_biology"
-)
+collection = get_collection()
 
-embedder = SentenceTransformer(EMBEDDING_MODEL)
+# Prefer the static-INT8 OpenVINO model for batch ingest when it has
+# been exported (see ov_embedder.py); otherwise the shared embedder,
+# which already runs in FP16/BF16.
+embedder = load_ov_embedder()
+if embedder is not None:
+    print("⚡ Using OpenVINO INT8 embedder")
+else:
+    embedder = get_embedder(EMBEDDING_MODEL)
 
 # -----------------------
 # Load Text Files from Data Folder
 # -----------------------
+def read_text_file(file_path):
+    """Read one file, returning (path, content, error) for the main loop."""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return file_path, f.read(), None
+    except Exception as e:
+        return file_path, None, e
+
 data_folder = "data"
-all_text = ""
+text_parts = []
 processed_files = []
 
 # Get all text files in the data folder
@@ -41,19 +64,23 @@ print(f"📂 Found {len(text_files)} text files:")
 for file_path in text_files:
     print(f"  - {os.path.basename(file_path)}")
 
-# Read and combine all text files
-for file_path in text_files:
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            if content.strip():
-                all_text += "\n\n" + content
-                processed_files.append(os.path.basename(file_path))
-                print(f"✅ Loaded: {os.path.basename(file_path)} ({len(content)} characters)")
-            else:
-                print(f"⚠️  Empty file: {os.path.basename(file_path)}")
-    except Exception as e:
-        print(f"❌ Error reading {file_path}: {e}")
+# Read and combine all text files — in parallel, since each file is
+# independent. Threads (not processes): reading releases the GIL, and
+# this module runs at import so spawning workers could re-execute it.
+# ex.map preserves input order so output stays stable.
+with ThreadPoolExecutor(max_workers=min(8, len(text_files))) as ex:
+    for file_path, content, error in ex.map(read_text_file, text_files):
+        if error is not None:
+            print(f"❌ Error reading {file_path}: {error}")
+        elif content.strip():
+            text_parts.append(content)
+            processed_files.append(os.path.basename(file_path))
+            print(f"✅ Loaded: {os.path.basename(file_path)} ({len(content)} characters)")
+        else:
+            print(f"⚠️  Empty file: {os.path.basename(file_path)}")
+
+# Single join instead of repeated += so total copying stays O(N).
+all_text = "\n\n".join(text_parts)
 
 if not all_text.strip():
     print("❌ No content found in any files")
@@ -71,27 +98,77 @@ print(f"Total chunks created: {len(chunks)}")
 # -----------------------
 # Embedding + Store
 # -----------------------
-embeddings = embedder.encode(chunks).tolist()
-
-ids = [f"chunk_{i}" for i in range(len(chunks))]
-
+emb_cache = EmbeddingCache(EMBEDDING_MODEL)
+
+# Content-hash ids keyed on the digest alone: stable across runs
+# (unlike Python's seeded hash()) and independent of position, so
+# inserting a chunk upstream doesn't shift its neighbours' ids, and
+# re-ingesting the same text lands on the same records via upsert below.
+# Chunks with identical text share a digest — and an identical
+# embedding/document — so they collapse to one record here.
+seen = set()
+deduped = []
+for chunk in chunks:
+    digest = hashlib.blake2b(chunk.encode("utf-8"), digest_size=8).hexdigest()
+    if digest not in seen:
+        seen.add(digest)
+        deduped.append((f"chunk_{digest}", chunk))
+ids = [cid for cid, _ in deduped]
+chunks = [chunk for _, chunk in deduped]
+
+# Token sets are computed once here rather than re-splitting the
+# document text on every query; Chroma metadata must be scalar, so they
+# persist as a space-joined string (set(metadata["tokens"].split()) on
+# the read side), and the file list is comma-joined for the same reason.
+source_files = ",".join(processed_files)
 metadatas = [
     {
-        "source": "biology_books", 
+        "source": "biology_books",
         "chunk_id": i,
-        "processed_files": processed_files,
+        "tokens": " ".join(sorted(set(_TOKEN_RE.findall(chunk.lower())))),
+        "processed_files": source_files,
         "total_files": len(processed_files)
     }
-    for i in range(len(chunks))
+    for i, chunk in enumerate(chunks)
 ]
 
-collection.add(
-    documents=chunks,
-    embeddings=embeddings,
-    ids=ids,
-    metadatas=metadatas
-)
-
-client.persist()
-
-print("✅ Chunks stored successfully in ChromaDB")
+# Stream encode -> add in fixed batches: the full float32 embedding
+# matrix never exists at once (keeping peak RAM flat however large the
+# corpus), Chroma's WAL can flush between inserts, and the HNSW build
+# working set stays small. Embeddings pass to Chroma as contiguous
+# float32 ndarrays — .tolist() would only box millions of Python floats
+# to have them re-parsed on the other side. Unchanged chunks come from
+# the on-disk cache instead of re-running the model.
+STORE_BATCH_SIZE = 512
+emb_parts = []
+for i in range(0, len(chunks), STORE_BATCH_SIZE):
+    batch = chunks[i:i + STORE_BATCH_SIZE]
+    batch_emb = np.ascontiguousarray(
+        emb_cache.encode(
+            embedder,
+            batch,
+            batch_size=ENCODE_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        ),
+        dtype=np.float32
+    )
+    # upsert, not add: add rejects existing ids, so a re-run against the
+    # persisted collection would fail instead of being idempotent.
+    with write_lock:
+        collection.upsert(
+            documents=batch,
+            embeddings=batch_emb,
+            ids=ids[i:i + STORE_BATCH_SIZE],
+            metadatas=metadatas[i:i + STORE_BATCH_SIZE]
+        )
+    # fp16 copy for the FAISS build below — half the resident bytes.
+    emb_parts.append(batch_emb.astype(np.float16))
+    print(f"💾 Stored {min(i + STORE_BATCH_SIZE, len(chunks))}/{len(chunks)} chunks")
+
+# Mirror the vectors into a FAISS HNSW index so the query hot path can
+# skip Chroma's search layer (Chroma keeps documents + metadata).
+build_index(np.concatenate(emb_parts).astype(np.float32), ids)
+
+print("✅ Chunks stored successfully in ChromaDB (+ FAISS index)")
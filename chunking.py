@@ -22,37 +22,45 @@ Guidelines:
 
 import re
 from typing import List
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
+from embedder import get_embedder
+
+# Compile once at import — passing raw pattern strings to re.sub/re.split
+# pays a cache lookup per call, and the per-sentence hot loops below run
+# these thousands of times per book.
+_SENT_RE = re.compile(r'(?<=[.!?]) +')
 
 def clean_text(text:str) -> str:
-    text= re.sub(r'\s+', ' ', text)
-    return text.strip()
+    # split()/join run entirely in the C string layer — one pass, one
+    # sized allocation, no regex engine — and whitespace-split + strip
+    # is exactly what the old r'\s+' sub produced.
+    return " ".join(text.split())
 
 def split_into_sentence(text: str) -> List[str]:
-    sentence_endings= r'(?<={.!?]) +'
-    sentences= re.split(sentence_endings, text)
+    sentences= _SENT_RE.split(text)
     return [s.strip() for s in sentences if len(s.strip()) > 0]
 
-def  fixed_size_chunking(
+def fixed_size_chunking(
     text: str,
     chunk_size: int = 400,
     overlap: int = 80
 ) -> List[str]:
-    text= clean_text(text)
-    chunks= []
-    start=0
+    text = clean_text(text)
+    chunks = []
+    start = 0
     text_length = len(text)
     while start < text_length:
-        end = start + chunk_size
-        chunk = text[start:end]
-        chunks.append(chunk)
+        end = min(start + chunk_size, text_length)
+        # Snap to the preceding space so chunks never break mid-word;
+        # rfind with bounds avoids slicing a copy just to search it.
         if end < text_length and not text[end].isspace():
-            last_space = chunk.rfind(" ")
-            if last_space != -1:
-                chunk = chunk[:last_space]
-                end = start + last_space
-        chunks.append(chunk.strip())
-        start = end - overlap
+            last_space = text.rfind(" ", start, end)
+            if last_space > start:
+                end = last_space
+        chunks.append(text[start:end].strip())
+        if end >= text_length:
+            break
+        start = max(end - overlap, start + 1)
     return chunks
 
 def sentence_based_chunking(
@@ -76,13 +84,31 @@ def sentence_based_chunking(
     return chunks
 
 
+def _iter_paragraphs(text: str):
+    """Yield newline-separated paragraphs.
+
+    ASCII text (the common case for textbook extracts) gets its newline
+    offsets from one vectorized byte scan — byte offsets equal character
+    offsets, so the positions slice the original str directly. Anything
+    else falls back to str.split.
+    """
+    if text.isascii():
+        buf = np.frombuffer(text.encode("ascii"), np.uint8)
+        start = 0
+        for nl in np.flatnonzero(buf == ord("\n")).tolist():
+            yield text[start:nl]
+            start = nl + 1
+        yield text[start:]
+    else:
+        yield from text.split("\n")
+
+
 def paragraph_based_chunking(
     text: str,
     max_size: int = 500
 ) -> List[str]:
-    paragraph =text.split("\n")
     chunks = []
-    for para in paragraph:
+    for para in _iter_paragraphs(text):
         para= clean_text(para)
         if not para:
             continue
@@ -96,7 +122,8 @@ def paragraph_based_chunking(
 def semantic_chunking(
     text: str,
     model_name: str = "all-MiniLM-L6-v2",
-    similarity_threshold: float = 0.75
+    similarity_threshold: float = 0.75,
+    batch_size: int = 64
 ) -> List[str]:
     """
     Uses embeddings to group semantically similar sentences
@@ -104,25 +131,29 @@ def semantic_chunking(
     text = clean_text(text)
     sentences = split_into_sentence(text)
 
-    model = SentenceTransformer(model_name)
-    embeddings = model.encode(sentences, convert_to_tensor=True)
-
-    chunks = []
-    current_chunk = sentences[0]
-    current_embedding = embeddings[0]
-
-    for i in range(1, len(sentences)):
-        similarity = util.cos_sim(current_embedding, embeddings[i]).item()
-
-        if similarity >= similarity_threshold:
-            current_chunk += " " + sentences[i]
-        else:
-            chunks.append(current_chunk.strip())
-            current_chunk = sentences[i]
-            current_embedding = embeddings[i]
-
-    chunks.append(current_chunk.strip())
-    return chunks
+    if not sentences:
+        return []
+    if len(sentences) == 1:
+        return [sentences[0].strip()]
+
+    model = get_embedder(model_name)
+    embeddings = model.encode(
+        sentences,
+        batch_size=batch_size,
+        convert_to_tensor=True,
+        normalize_embeddings=True,
+        show_progress_bar=False
+    )
+
+    # All adjacent cosine similarities in one fused op — the old
+    # per-pair util.cos_sim(...).item() loop launched a tiny kernel and
+    # forced a GPU->CPU sync for every sentence.
+    # .float() first: the CPU embedder runs in bfloat16 (see embedder.py)
+    # and numpy has no bf16 dtype, so .numpy() on the raw tensor raises.
+    sims = (embeddings[:-1] * embeddings[1:]).sum(dim=1).float().cpu().numpy()
+    break_points = np.flatnonzero(sims < similarity_threshold) + 1
+    bounds = [0, *break_points.tolist(), len(sentences)]
+    return [" ".join(sentences[s:e]).strip() for s, e in zip(bounds, bounds[1:])]
 
 def agentic_chunking(
     text: str,
@@ -0,0 +1,32 @@
+"""
+Shared SentenceTransformer singleton.
+
+chunking.semantic_chunking, chroma_store.py and query_test.py each used
+to construct their own SentenceTransformer — a ~90 MB model load (plus
+CUDA init) per call site, repeated for every semantic_chunking call.
+Fetch models through this lru_cache instead so a process loads each
+embedder exactly once.
+"""
+
+import functools
+
+import torch
+from sentence_transformers import SentenceTransformer
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+
+
+@functools.lru_cache(maxsize=4)
+def get_embedder(name: str = DEFAULT_MODEL) -> SentenceTransformer:
+    model = SentenceTransformer(
+        name, device="cuda" if torch.cuda.is_available() else "cpu"
+    )
+    # MiniLM truncates past 256 tokens anyway — capping the sequence
+    # length keeps every batch from padding beyond what the model uses.
+    model.max_seq_length = 256
+    # Half precision everywhere: FP16 on CUDA, BF16 on CPU. Lossless for
+    # MiniLM-class encoders and ~2x the FP32 encode throughput. (The
+    # offline ingest can go further via the ONNX/OpenVINO INT8 export in
+    # ov_embedder.py.)
+    model = model.half() if torch.cuda.is_available() else model.to(torch.bfloat16)
+    return model
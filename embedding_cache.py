@@ -0,0 +1,67 @@
+"""
+Persistent on-disk embedding cache keyed by (model name, content hash).
+
+Re-ingesting a book after a minor text fix re-pays the full transformer
+cost for every unchanged chunk. Cache each chunk's vector under
+./.emb_cache/<model>/<blake2b digest>.npy — stored as float16 to halve
+disk and IO — and only send cache misses through model.encode. Keys are
+namespaced per model directory so switching from MiniLM to another
+embedder never collides.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+CACHE_ROOT = "./.emb_cache"
+
+
+def _content_key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(self, model_name: str, root: str = CACHE_ROOT):
+        self.dir = os.path.join(root, model_name.replace("/", "_"))
+        os.makedirs(self.dir, exist_ok=True)
+
+    def _path(self, text: str) -> str:
+        return os.path.join(self.dir, _content_key(text) + ".npy")
+
+    def get(self, text: str):
+        try:
+            return np.load(self._path(text)).astype(np.float32)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, text: str, embedding) -> None:
+        np.save(self._path(text), np.asarray(embedding, dtype=np.float16))
+
+    def encode(self, embedder, texts, **encode_kwargs):
+        """Encode texts, serving unchanged ones from the cache.
+
+        Misses are encoded in one batched call and written back; the
+        result preserves the original order.
+        """
+        embeddings = [None] * len(texts)
+        miss_indices = []
+        for i, text in enumerate(texts):
+            hit = self.get(text)
+            if hit is not None:
+                embeddings[i] = hit
+            else:
+                miss_indices.append(i)
+
+        if miss_indices:
+            fresh = embedder.encode(
+                [texts[i] for i in miss_indices], **encode_kwargs
+            )
+            for j, i in enumerate(miss_indices):
+                embeddings[i] = np.asarray(fresh[j], dtype=np.float32)
+                self.put(texts[i], fresh[j])
+
+        hits = len(texts) - len(miss_indices)
+        if hits:
+            print(f"♻️  Embedding cache: {hits}/{len(texts)} chunks reused")
+        return np.stack(embeddings).astype(np.float32)
@@ -0,0 +1,107 @@
+"""
+Optional OpenVINO static-INT8 embedder for the offline ingest path.
+
+Dynamic INT8 quantization is a known loss on transformer encoders, but
+*static* INT8 with a calibration set wins on CPUs with VNNI, and the
+batch ingest in chroma_store.py is exactly that workload. This module is
+opt-in: run `python ov_embedder.py <calibration.txt>` once to export and
+quantize MiniLM, after which chroma_store.py picks up the INT8 model
+automatically. Requires `optimum[openvino]`; everything degrades to the
+regular SentenceTransformer when it is missing.
+"""
+
+import os
+
+import numpy as np
+
+MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
+OV_MODEL_DIR = "./ov_minilm_int8"
+
+
+class OVEmbedder:
+    """Minimal drop-in for SentenceTransformer.encode on an OV model."""
+
+    def __init__(self, model, tokenizer):
+        self.model = model
+        self.tokenizer = tokenizer
+
+    def encode(self, sentences, batch_size=256, convert_to_numpy=True,
+               normalize_embeddings=True, show_progress_bar=False):
+        if isinstance(sentences, str):
+            sentences = [sentences]
+        parts = []
+        for start in range(0, len(sentences), batch_size):
+            batch = sentences[start:start + batch_size]
+            inputs = self.tokenizer(
+                batch, padding=True, truncation=True, max_length=256,
+                return_tensors="np"
+            )
+            token_embeddings = self.model(**inputs).last_hidden_state
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(
+                mask.sum(axis=1), 1e-9, None
+            )
+            parts.append(pooled)
+        embeddings = np.concatenate(parts, axis=0).astype(np.float32)
+        if normalize_embeddings:
+            embeddings /= np.clip(
+                np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None
+            )
+        return embeddings
+
+
+def load_ov_embedder(model_dir=OV_MODEL_DIR):
+    """Return the quantized embedder, or None if not exported/installed."""
+    if not os.path.isdir(model_dir):
+        return None
+    try:
+        from optimum.intel import OVModelForFeatureExtraction
+        from transformers import AutoTokenizer
+    except ImportError:
+        return None
+    model = OVModelForFeatureExtraction.from_pretrained(model_dir)
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    return OVEmbedder(model, tokenizer)
+
+
+def export_minilm_int8(calibration_texts, model_dir=OV_MODEL_DIR):
+    """One-time export + static INT8 quantization with calibration data."""
+    from datasets import Dataset
+    from optimum.intel import (OVConfig, OVModelForFeatureExtraction,
+                               OVQuantizationConfig, OVQuantizer)
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_ID)
+    model = OVModelForFeatureExtraction.from_pretrained(MODEL_ID, export=True)
+
+    def preprocess(examples):
+        return tokenizer(examples["text"], padding="max_length",
+                         truncation=True, max_length=256)
+
+    calibration = Dataset.from_dict(
+        {"text": calibration_texts[:512]}
+    ).map(preprocess, batched=True)
+
+    quantizer = OVQuantizer.from_pretrained(model)
+    # quantize() takes an OVConfig; the quantization settings nest inside
+    # it (optimum-intel >= 1.16 signature, pinned in requirements.txt).
+    quantizer.quantize(
+        calibration_dataset=calibration,
+        ov_config=OVConfig(
+            quantization_config=OVQuantizationConfig(bits=8, sym=True)
+        ),
+        save_directory=model_dir,
+    )
+    tokenizer.save_pretrained(model_dir)
+    print(f"✅ INT8 model saved to {model_dir}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python ov_embedder.py <calibration_text_file>")
+        sys.exit(1)
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        texts = [line.strip() for line in f if line.strip()]
+    export_minilm_int8(texts)
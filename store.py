@@ -0,0 +1,50 @@
+"""
+Shared ChromaDB client/collection singletons for BioLens.
+
+Every script used to build its own chromadb.Client, which re-opens the
+persisted store (mmap + HNSW index reload) per process object. Route all
+access through these lru_cache singletons so a process pays the init
+cost once, and serialize writes through `write_lock` — HNSW inserts are
+not safe under concurrent writers in some Chroma versions. Reads can run
+concurrently without the lock.
+"""
+
+import functools
+import threading
+
+import chromadb
+from chromadb.config import Settings
+
+PERSIST_DIRECTORY = "./chroma_db"
+COLLECTION_NAME = "biolens_biology"
+
+write_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def get_client():
+    # PersistentClient is the current API: the legacy
+    # Client(Settings(persist_directory=...)) form silently returns an
+    # ephemeral client on recent chromadb releases, and persistence is
+    # automatic — there is no client.persist() to call anymore.
+    return chromadb.PersistentClient(
+        path=PERSIST_DIRECTORY,
+        settings=Settings(anonymized_telemetry=False)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_collection(name: str = COLLECTION_NAME):
+    # Cosine space on L2-normalized vectors makes distance = 1 - dot
+    # product, which is exactly what the confidence math in
+    # query_test.py assumes. ef/M trade a slower one-time build for
+    # better recall at low search latency.
+    return get_client().get_or_create_collection(
+        name=name,
+        metadata={
+            "hnsw:space": "cosine",
+            "hnsw:construction_ef": 200,
+            "hnsw:M": 32,
+            "hnsw:search_ef": 64,
+        }
+    )
@@ -3,40 +3,76 @@ Basic test without external dependencies to verify chunking logic
 """
 
 import re
-from typing import List
+from typing import Iterator, List
+
+# Compiled once at import: passing raw pattern strings to re.sub/re.split
+# repeats the pattern-cache lookup on every call, which adds up when
+# paragraph_based_chunking loops over thousands of paragraphs.
+_NLWS_RE = re.compile(r'[^\S\n]+')
+_SENT_BOUND = re.compile(r'[.!?]\s+')
 
 def clean_text(text: str) -> str:
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    # split()/join collapse whitespace runs entirely in the C string
+    # layer — no regex engine, one sized allocation — and subsume strip.
+    return " ".join(text.split())
 
-def split_into_sentence(text: str) -> List[str]:
-    sentence_endings = r'(?<=[.!?]) +'
-    sentences = re.split(sentence_endings, text)
-    return [s.strip() for s in sentences if len(s.strip()) > 0]
+def split_into_sentence(text: str) -> Iterator[str]:
+    # Walk boundary matches and slice the source directly instead of
+    # materializing re.split's intermediate list and re-stripping every
+    # element; sentences stream lazily to the chunking loop.
+    last = 0
+    for m in _SENT_BOUND.finditer(text):
+        yield text[last:m.start() + 1]
+        last = m.end()
+    if last < len(text):
+        yield text[last:]
 
-def paragraph_based_chunking(text: str, max_size: int = 500) -> List[str]:
-    paragraphs = text.split("\n")
-    chunks = []
-    for para in paragraphs:
-        para = clean_text(para)
+def iter_chunks(text: str, max_size: int = 500) -> Iterator[str]:
+    # Normalize whitespace in one pass over the whole input, keeping
+    # newlines intact as paragraph boundaries — running clean_text on
+    # every paragraph after the split re-scanned the same bytes twice.
+    text = _NLWS_RE.sub(' ', text)
+    for para in text.split("\n"):
+        para = para.strip()
         if not para:
             continue
         if len(para) <= max_size:
-            chunks.append(para)
+            yield para
         else:
-            # For long paragraphs, split by sentences
-            sentences = split_into_sentence(para)
-            current_chunk = ""
-            for sentence in sentences:
-                if len(current_chunk) + len(sentence) <= max_size:
-                    current_chunk += " " + sentence if current_chunk else sentence
+            # For long paragraphs, split by sentences. Accumulate in a
+            # list with a running length — += on the chunk string copies
+            # the whole buffer every sentence (O(L^2) per paragraph).
+            buf = []
+            buf_len = 0
+            for sentence in split_into_sentence(para):
+                if buf_len + len(sentence) <= max_size:
+                    if buf:
+                        buf_len += 1  # joining space
+                    buf.append(sentence)
+                    buf_len += len(sentence)
                 else:
-                    if current_chunk:
-                        chunks.append(current_chunk.strip())
-                    current_chunk = sentence
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-    return chunks
+                    if buf:
+                        yield " ".join(buf)
+                    buf = [sentence]
+                    buf_len = len(sentence)
+            if buf:
+                yield " ".join(buf)
+
+def paragraph_based_chunking(text: str, max_size: int = 500) -> List[str]:
+    # List-returning wrapper; consumers that only iterate once can use
+    # iter_chunks directly and never hold the full chunk list.
+    return list(iter_chunks(text, max_size))
+
+def make_chunker(max_size: int = 500):
+    """Return paragraph_based_chunking specialized for a fixed max_size.
+
+    Callers that chunk many documents at one size (the pipeline does)
+    bind the limit once instead of threading the argument through every
+    call; the closure cell also replaces the per-call default lookup.
+    """
+    def chunk(text: str) -> List[str]:
+        return paragraph_based_chunking(text, max_size)
+    return chunk
 
 # Test with sample biology text
 sample_text = """Biology: The Study of Life
@@ -2,114 +2,220 @@
 Test pipeline for chunking and storing data without external dependencies
 """
 
+import heapq
+import mmap
 import os
-import glob
 import json
-from test_chunking_basic import paragraph_based_chunking
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from test_chunking_basic import make_chunker
+
+def list_text_files(data_folder="data"):
+    """Return the sorted .txt paths in the data folder."""
+    # os.scandir hands back dirents directly — no fnmatch pass over the
+    # directory like glob — and sorting keeps processing order stable.
+    try:
+        with os.scandir(data_folder) as it:
+            return sorted(
+                e.path for e in it if e.is_file() and e.name.endswith(".txt")
+            )
+    except OSError:
+        return []
+
+def read_file(file_path):
+    """Read one text file via mmap, returning its decoded content.
+
+    Decoding straight from the mapped pages skips read()'s intermediate
+    bytes object — one copy (into the str) instead of two — and the
+    kernel pages data in on demand. CRLF normalization matches what text
+    mode's universal-newline handling used to produce. Empty files
+    can't be mapped, so guard on size.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return str(memoryview(mm), "utf-8").replace("\r\n", "\n")
+
+def read_and_chunk(file_path, max_size=500):
+    """Worker: load and chunk one file.
+
+    Returns (filename, chunks, error); chunks is None for empty files.
+    Paragraphs never cross file boundaries, so per-file chunking yields
+    the same chunks as chunking the concatenated corpus.
+    """
+    name = os.path.basename(file_path)
+    try:
+        content = read_file(file_path)
+    except Exception as e:
+        return name, None, e
+    if not content.strip():
+        return name, None, None
+    return name, make_chunker(max_size)(content), None
 
 def load_text_files(data_folder="data"):
     """Load all text files from the data folder"""
-    all_text = ""
+    text_parts = []
     processed_files = []
-    
-    # Get all text files in the data folder
-    text_files = glob.glob(os.path.join(data_folder, "*.txt"))
-    
+
+    text_files = list_text_files(data_folder)
+
     if not text_files:
         print(f"❌ No text files found in {data_folder} folder")
         return None, []
-    
+
     print(f"📂 Found {len(text_files)} text files:")
     for file_path in text_files:
         print(f"  - {os.path.basename(file_path)}")
-    
-    # Read and combine all text files
+
     for file_path in text_files:
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                if content.strip():
-                    all_text += "\n\n" + content
-                    processed_files.append(os.path.basename(file_path))
-                    print(f"✅ Loaded: {os.path.basename(file_path)} ({len(content)} characters)")
-                else:
-                    print(f"⚠️  Empty file: {os.path.basename(file_path)}")
+            content = read_file(file_path)
+            if content.strip():
+                text_parts.append(content)
+                processed_files.append(os.path.basename(file_path))
+                print(f"✅ Loaded: {os.path.basename(file_path)} ({len(content)} characters)")
+            else:
+                print(f"⚠️  Empty file: {os.path.basename(file_path)}")
         except Exception as e:
             print(f"❌ Error reading {file_path}: {e}")
-    
+
+    all_text = "\n\n".join(text_parts)
+
     if not all_text.strip():
         print("❌ No content found in any files")
         return None, []
-    
+
     print(f"\n📄 Total combined text length: {len(all_text)} characters")
     return all_text, processed_files
 
 def store_chunks_locally(chunks, processed_files, output_file="chunks.json"):
     """Store chunks in a JSON file for testing"""
-    chunk_data = {
-        "metadata": {
-            "total_chunks": len(chunks),
-            "processed_files": processed_files,
-            "total_files": len(processed_files)
-        },
-        "chunks": []
+    metadata = {
+        "total_chunks": len(chunks),
+        "processed_files": processed_files,
+        "total_files": len(processed_files)
     }
-    
-    for i, chunk in enumerate(chunks):
-        chunk_data["chunks"].append({
-            "id": f"chunk_{i}",
-            "content": chunk,
-            "metadata": {
-                "source": "biology_books",
-                "chunk_id": i,
-                "length": len(chunk)
-            }
-        })
-    
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(chunk_data, f, indent=2, ensure_ascii=False)
-    
+
+    # Stream each record straight to the buffered writer: the old code
+    # built a throwaway dict per chunk (6N dict slots of duplicated
+    # keys) just to feed json.dump, and held the whole structure in RAM.
+    # Only the chunk text itself goes through the JSON encoder; the
+    # fixed-shape framing is written as preformatted strings. Compact
+    # separators (no indent) roughly halve the rendered size, and the
+    # 1 MiB buffer batches the writes into few syscalls.
+    with open(output_file, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write('{"metadata":')
+        json.dump(metadata, f, ensure_ascii=False, separators=(",", ":"))
+        f.write(',"chunks":[')
+        for i, chunk in enumerate(chunks):
+            if i:
+                f.write(",")
+            f.write(f'{{"id":"chunk_{i}","content":')
+            json.dump(chunk, f, ensure_ascii=False)
+            f.write(
+                f',"metadata":{{"source":"biology_books",'
+                f'"chunk_id":{i},"length":{len(chunk)}}}}}'
+            )
+        f.write("]}")
+
     print(f"✅ Chunks stored in {output_file}")
-    return chunk_data
-
-def simulate_query(chunks, query, top_k=3):
-    """Simple keyword-based query simulation"""
-    query_words = query.lower().split()
-    scored_chunks = []
-    
-    for i, chunk in enumerate(chunks):
-        chunk_lower = chunk.lower()
-        score = 0
-        
-        # Simple scoring: count query word matches
-        for word in query_words:
-            score += chunk_lower.count(word) * len(word)
-        
-        if score > 0:
-            scored_chunks.append((i, chunk, score))
-    
-    # Sort by score and return top_k
-    scored_chunks.sort(key=lambda x: x[2], reverse=True)
-    return scored_chunks[:top_k]
+    return metadata
+
+def build_postings(chunks_lower):
+    """Build an inverted index: word -> [(chunk_id, count), ...]."""
+    postings = defaultdict(list)
+    for i, chunk_lower in enumerate(chunks_lower):
+        for word, n in Counter(chunk_lower.split()).items():
+            postings[word].append((i, n))
+    return postings
+
+def simulate_query(chunks, postings, query, top_k=3):
+    """Simple keyword-based query simulation over the inverted index"""
+    # Scoring walks only the posting lists for the query's words —
+    # O(sum of posting lengths) per query instead of re-scanning every
+    # chunk's text.
+    scores = defaultdict(int)
+    for word in query.lower().split():
+        for i, n in postings.get(word, ()):
+            scores[i] += n * len(word)
+
+    # Top-k via a C-implemented heap: O(n log k) instead of sorting
+    # every matching chunk just to keep three.
+    top = heapq.nlargest(top_k, scores.items(), key=itemgetter(1))
+    return [(i, chunks[i], score) for i, score in top]
+
+def simulate_queries(chunks, postings, queries, top_k=3):
+    """Score a whole batch of queries in one pass over the postings.
+
+    Words shared between queries (stopwords like 'the' or 'of') are
+    unioned first, so each distinct word's posting list is walked once
+    with the accumulated hits fanned out to every query containing it —
+    total passes drop from Q to 1. Duplicate words within one query keep
+    one entry per occurrence, matching simulate_query's scoring.
+    """
+    word_to_queries = defaultdict(list)
+    for qid, query in enumerate(queries):
+        for word in query.lower().split():
+            word_to_queries[word].append(qid)
+
+    scores = [defaultdict(int) for _ in queries]
+    for word, qids in word_to_queries.items():
+        posting = postings.get(word)
+        if not posting:
+            continue
+        weight = len(word)
+        for i, n in posting:
+            inc = n * weight
+            for qid in qids:
+                scores[qid][i] += inc
+
+    return [
+        [(i, chunks[i], score)
+         for i, score in heapq.nlargest(top_k, s.items(), key=itemgetter(1))]
+        for s in scores
+    ]
 
 if __name__ == "__main__":
     print("🚀 Testing complete chunking and storage pipeline...")
-    
-    # Load text files
-    all_text, processed_files = load_text_files()
-    
-    if all_text:
-        # Chunk the text
-        print("\n🔪 Chunking text...")
-        chunks = paragraph_based_chunking(all_text)
+
+    text_files = list_text_files()
+    chunks = []
+    processed_files = []
+
+    if not text_files:
+        print("❌ No text files found in data folder")
+    else:
+        print(f"📂 Found {len(text_files)} text files:")
+        for file_path in text_files:
+            print(f"  - {os.path.basename(file_path)}")
+
+        # Read + chunk each file in parallel — files chunk independently,
+        # which also removes the combined-corpus string entirely.
+        print("\n🔪 Chunking files in parallel...")
+        with ProcessPoolExecutor() as ex:
+            for name, file_chunks, error in ex.map(read_and_chunk, text_files):
+                if error is not None:
+                    print(f"❌ Error reading {name}: {error}")
+                elif file_chunks is None:
+                    print(f"⚠️  Empty file: {name}")
+                else:
+                    chunks.extend(file_chunks)
+                    processed_files.append(name)
+                    print(f"✅ Chunked: {name} ({len(file_chunks)} chunks)")
+
+    if chunks:
         print(f"✅ Created {len(chunks)} chunks")
-        
+
         # Store chunks
         print("\n💾 Storing chunks...")
         chunk_data = store_chunks_locally(chunks, processed_files)
         
         # Test queries
         print("\n🔍 Testing queries...")
+        chunks_lower = [c.lower() for c in chunks]
+        postings = build_postings(chunks_lower)
         test_queries = [
             "What is the function of mitochondria?",
             "How does photosynthesis work?",
@@ -117,10 +223,10 @@ if __name__ == "__main__":
             "Explain DNA structure"
         ]
         
-        for query in test_queries:
+        batch_results = simulate_queries(chunks, postings, test_queries)
+        for query, results in zip(test_queries, batch_results):
             print(f"\n❓ Query: {query}")
-            results = simulate_query(chunks, query)
-            
+
             if results:
                 for i, (chunk_idx, chunk, score) in enumerate(results):
                     print(f"  Result {i+1} (Score: {score}): {chunk[:100]}...")